@@ -1,72 +1,120 @@
 """MicroWrap."""
-import errno
+# Hot-path locals are annotated with builtin types (dict, list, str) rather than typing generics,
+# so that Cython can compile operations on them to direct C API calls.
+import functools
+import io
 import json
 import logging
 import os
+import queue
+import selectors
+import signal
 import subprocess
 import sys
 import threading
-import traceback
-from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from socketserver import ThreadingMixIn
-from typing import Any, Dict, Iterable, List, TextIO, Tuple, Union
-from urllib.parse import parse_qs
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Tuple, Union
+from urllib.parse import parse_qs, unquote_plus
 from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
 from wsgiref.types import StartResponse, WSGIEnvironment
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import bjoern
+except ImportError:
+    bjoern = None
+
 ###
 # Logging
 ###
 
 
-class RotatingLogger:
-    """A logger that writes to a file and rotates it when it gets too big."""
+LOGGER = logging.getLogger("microwrap")
 
-    def __init__(
-        self,
-        terminal: TextIO,
-        log_file: str,
-        max_bytes=20 * 1_000_000,
-        backup_count=5,
-    ):
-        self.terminal = terminal
-        self.log = RotatingFileHandler(
-            log_file, maxBytes=max_bytes, backupCount=backup_count
-        )
-        self.log.setFormatter(logging.Formatter("%(message)s"))
 
-    def write(self, message: str):
-        """Write a message to the log."""
-        message = message.strip("\n")
-        if message:
-            self.terminal.write(message + "\n")
-            self.log.emit(logging.makeLogRecord({"msg": message}))
-            self.flush()
+def configure_logging(
+    log_file: str,
+    error_file: str,
+    max_bytes=20 * 1_000_000,
+    backup_count=5,
+    capacity=512,
+):
+    """Log to the terminal and to rotating files, batching writes to the log file."""
+    if LOGGER.handlers:
+        return  # already configured, e.g. when run with `python -m microwrap.microwrap`
+    formatter = logging.Formatter("%(message)s")
+    terminal = logging.StreamHandler(sys.stdout)
+    log = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+    errors = RotatingFileHandler(error_file, maxBytes=max_bytes, backupCount=backup_count)
+    errors.setLevel(logging.ERROR)
+    for handler in (terminal, log, errors):
+        handler.setFormatter(formatter)
+    LOGGER.addHandler(terminal)
+    LOGGER.addHandler(MemoryHandler(capacity, flushLevel=logging.ERROR, target=log))
+    LOGGER.addHandler(errors)
+    LOGGER.setLevel(logging.INFO)
+    LOGGER.propagate = False
 
-    def flush(self):
-        """Flush the log."""
-        self.terminal.flush()
-        self.log.flush()
 
-    def close(self):
-        """Close the log."""
-        self.log.close()
+configure_logging("microwrap.log", "microwrap.err")
+
 
+class LoggerStream(io.TextIOBase):
+    """A text stream that logs everything written to it as one message on each flush."""
 
-sys.stdout = RotatingLogger(sys.stdout, "microwrap.log")
-sys.stderr = RotatingLogger(sys.stderr, "microwrap.err")
+    def __init__(self, logger: logging.Logger, level: int):
+        super().__init__()
+        self.logger = logger
+        self.level = level
+        self._parts: List[str] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._parts.append(text)
+        return len(text)
+
+    def flush(self):
+        message = "".join(self._parts).rstrip("\n")
+        self._parts.clear()
+        if message:
+            self.logger.log(self.level, message)
 
 
 class Config:
     """A MicroWrap configuration file."""
 
     def __init__(self, path: str):
-        with open(path, encoding="utf-8") as file:
-            json_config = json.load(file)
+        with open(path, "rb") as file:
+            json_config = json_loads(file.read())
             if isinstance(json_config, dict):
                 self.config = json_config
             else:
                 raise ValueError("Invalid configuration file!")
+        self._allowed_params = frozenset(self.config.get("allowedParameters", []))
+        self._base_params = MappingProxyType(
+            {
+                key: "" if value is True else value
+                for key, value in self.get_default_params().items()
+                if value is not False
+            }
+        )
+        self._flags = MappingProxyType(
+            {key: f"--{key}" for key in self._allowed_params.union(self.get_default_params())}
+        )
+        self._abs_executable = os.path.abspath(self.get_executable_path() or "")
+        self._server_header = ("Server", f"{SERVER_NAME} {self.get_executable_path()}")
+        self._worker_pool = None
+        if self.get_persistent_worker():
+            self._worker_pool = WorkerPool(self._abs_executable, self.get_worker_count())
 
     def get_host(self) -> str:
         """Return the host to bind to."""
@@ -86,25 +134,78 @@ class Config:
         # should be a boolean
         return self.config.get("concurrent", True)
 
+    def get_process_count(self) -> int:
+        """Return the number of server processes to run."""
+        # TODO: verify valid config
+        # should be a positive integer
+        if not self.get_concurrent():
+            return 1
+        return self.config.get("processes", DEFAULT_PROCESSES)
+
+    def get_thread_count(self) -> int:
+        """Return the number of threads handling requests in each server process."""
+        # TODO: verify valid config
+        # should be a positive integer
+        # The default is shared between the server processes rather than multiplied by them
+        return self.config.get("threads", max(1, DEFAULT_THREADS // self.get_process_count()))
+
     def get_executable_path(self) -> str:
         """Return the path to the executable."""
         # TODO: verify valid config
         # should be an existing path
         return self.config.get("executablePath")
 
-    def get_allowed_params(self) -> List[str]:
-        """Return the list of allowed query-string parameters."""
+    def get_abs_executable_path(self) -> str:
+        """Return the absolute path to the executable."""
+        return self._abs_executable
+
+    def get_persistent_worker(self) -> bool:
+        """Return whether to keep the executable running and pipe requests to it."""
+        # TODO: verify valid config
+        # should be a boolean
+        return self.config.get("persistentWorker", False)
+
+    def get_worker_count(self) -> int:
+        """Return the maximum number of persistent worker processes in each server process."""
+        # TODO: verify valid config
+        # should be a positive integer
+        default = self.get_thread_count() if self.get_concurrent() else 1
+        return self.config.get("workerCount", default)
+
+    def get_worker_pool(self) -> "WorkerPool":
+        """Return the pool of persistent workers, or None if they are disabled."""
+        return self._worker_pool
+
+    def get_server_header(self) -> Tuple[str, str]:
+        """Return the Server response header identifying the wrapped executable."""
+        return self._server_header
+
+    def get_allowed_params(self) -> FrozenSet[str]:
+        """Return the allowed query-string parameters."""
         # TODO: verify valid config
         # should be a list of strings
-        return self.config.get("allowedParameters", [])
+        return self._allowed_params
 
-    def get_default_params(self) -> Dict[str, Union[str, bool]]:
+    def get_default_params(self) -> Mapping[str, Union[str, bool]]:
         """Return the default query-string parameter values."""
         # TODO: verify valid config
         # valid if (isinstance(value, str) or isinstance(value, bool)) and value != ""
         # if a value is "", error should include "should be `true` to indicate a value-less option"
         # if a value is not a str or bool, error should include "should be a string or boolean"
-        return self.config.get("defaultParameters", {})
+        return MappingProxyType(self.config.get("defaultParameters", {}))
+
+    def get_flags(self) -> Mapping[str, str]:
+        """Return the command-line option for each parameter name."""
+        return self._flags
+
+    def get_base_params(self) -> Mapping[str, str]:
+        """Return the parameters passed when a request overrides none of the defaults."""
+        return self._base_params
+
+    def close(self):
+        """Release resources held by this configuration."""
+        if self._worker_pool is not None:
+            self._worker_pool.close()
 
     def __str__(self):
         return str(self.config)
@@ -116,8 +217,12 @@ class Config:
 
 
 USAGE_HELP = "Usage: microwrap <host> <port>"
+SERVER_NAME = "MicroWrap/1.0.0"
 CONFIG_PATH = "microwrap.json"
-MAX_THREADS = os.cpu_count() * 4
+DEFAULT_PROCESSES = os.cpu_count() or 1
+DEFAULT_THREADS = min(32, (os.cpu_count() or 1) + 4)
+QUERY_CACHE_SIZE = 1024
+FAST_QUERY_MAX_LENGTH = 512
 
 
 ###
@@ -125,40 +230,158 @@ MAX_THREADS = os.cpu_count() * 4
 ###
 
 
-def parse_query_params(config: Config, query_str) -> Dict[str, str]:
+_CONFIG_CACHE: Dict[str, Tuple[int, Config]] = {}
+_CONFIG_LOCK = threading.Lock()
+
+
+def get_config(path: str) -> Config:
+    """Return the configuration at path, re-parsing it only when the file changes."""
+    cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == os.stat(path).st_mtime_ns:
+        return cached[1]
+    # Only one thread rebuilds a changed configuration, so no Config or WorkerPool is leaked
+    with _CONFIG_LOCK:
+        mtime = os.stat(path).st_mtime_ns
+        cached = _CONFIG_CACHE.get(path)
+        if cached is None or cached[0] != mtime:
+            if cached is not None:
+                cached[1].close()
+                # The memoized query parameters are keyed on, and so keep alive, the old Config
+                _parse_query_params.cache_clear()
+            cached = (mtime, Config(path))
+            _CONFIG_CACHE[path] = cached
+        return cached[1]
+
+
+def parse_query_params(config: Config, query_str: str) -> Dict[str, str]:
     """Parse parameters from the request."""
-    query_params = parse_qs(query_str, keep_blank_values=True)
-    allowed_params = config.get_allowed_params()
-    default_params = config.get_default_params()
+    return dict(_parse_query_params(config, query_str))
+
+
+def split_query(query_str: str) -> Dict[str, str]:
+    """Split a query string into parameters, keeping the last value of repeated parameters."""
+    if len(query_str) >= FAST_QUERY_MAX_LENGTH:
+        query_params = parse_qs(query_str, keep_blank_values=True)
+        return {key: values[-1] for key, values in query_params.items()}
+    # Equivalent to parse_qs for the short query strings seen in practice, without the lists
+    params: dict = {}
+    pair: str
+    for pair in query_str.split("&"):
+        if pair:
+            key, _, value = pair.partition("=")
+            params[unquote_plus(key)] = unquote_plus(value)
+    return params
 
-    params = {
-        key: "" if value is True else value
-        for key, value in default_params.items()
-        if value is not False
-    }
 
-    for allowed_param in allowed_params:
-        value = query_params.get(allowed_param, None)
-        if value is not None:
-            params[allowed_param] = value[-1]
+@functools.lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _parse_query_params(config: Config, query_str: str) -> Dict[str, str]:
+    """Parse parameters from the request, memoized; callers must not mutate the result."""
+    query_params: dict = split_query(query_str)
+    allowed_params: frozenset = config.get_allowed_params()
+    params: dict = config.get_base_params().copy()
+    for key, value in query_params.items():
+        if key in allowed_params:
+            params[key] = value
 
     return params
 
 
-def get_response_headers(body: str | bytes) -> List[str]:
+def get_response_headers(body: bytes, config: Config | None = None) -> List[Tuple[str, str]]:
     """Return the response headers derived from the response body."""
-    if isinstance(body, str):
-        body = body.encode()
-        content = "text/plain"
-    elif isinstance(body, bytes):
-        content = "application/octet-stream"
     return [
-        ("Server", f"MicroWrap/1.0.0 {Config(CONFIG_PATH).get_executable_path()}"),
+        ("Server", SERVER_NAME) if config is None else config.get_server_header(),
         ("Content-Length", str(len(body))),
-        ("Content-Type", content),
+        ("Content-Type", "text/plain"),
     ]
 
 
+###
+# Persistent workers
+###
+
+
+class WorkerPool:
+    """A pool of long-lived executable processes that handle one request per line.
+
+    Each request is written to a worker's stdin as a JSON array of arguments followed by a
+    newline, and the worker must answer with exactly one line on its stdout.
+    """
+
+    def __init__(self, executable: str, size: int):
+        self.executable = executable
+        self.closed = False
+        # Held while checking closed and returning a worker, and while close() drains the pool
+        self.lock = threading.Lock()
+        # Each slot holds an idle worker, or None if its worker has not been started yet; the
+        # most recently used worker is reused first, so only as many workers are started as
+        # there are requests handled at once
+        self.idle: queue.LifoQueue[subprocess.Popen | None] = queue.LifoQueue()
+        for _ in range(size):
+            self.idle.put(None)
+
+    def spawn(self) -> subprocess.Popen:
+        """Start a new worker process."""
+        return subprocess.Popen(
+            [self.executable],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=-1,
+            close_fds=False,
+        )
+
+    def invoke(self, arguments: List[str]) -> bytes:
+        """Send the arguments to an idle worker and return its response line."""
+        worker = self.idle.get()
+        try:
+            # A closed pool still serves requests that were already in flight when it was
+            # closed, starting a worker for the request that is stopped once it is done
+            if worker is None:
+                worker = self.spawn()
+            worker.stdin.write(json.dumps(arguments).encode() + b"\n")
+            worker.stdin.flush()
+            response = worker.stdout.readline()
+            if not response:
+                self.stop(worker)
+                worker, exitcode = None, worker.returncode
+                raise RuntimeError(f"Persistent worker exited with code {exitcode}")
+        except BaseException:
+            if worker is not None:
+                self.stop(worker)
+                worker = None
+            raise
+        finally:
+            retired = None
+            with self.lock:
+                if self.closed:
+                    retired, worker = worker, None
+                self.idle.put(worker)
+            if retired is not None:
+                self.stop(retired)
+        return response
+
+    @staticmethod
+    def stop(worker: subprocess.Popen):
+        """Stop a worker process and release its pipes."""
+        worker.kill()
+        worker.communicate()
+
+    def close(self):
+        """Stop all idle workers; busy workers are stopped when their request finishes."""
+        drained = []
+        with self.lock:
+            self.closed = True
+            while True:
+                try:
+                    drained.append(self.idle.get_nowait())
+                except queue.Empty:
+                    break
+            for _ in drained:
+                self.idle.put(None)
+        for worker in drained:
+            if worker is not None:
+                self.stop(worker)
+
+
 ###
 # Request handler
 ###
@@ -175,36 +398,45 @@ class InvocationRequest:
         self.path = env.get("PATH_INFO", "/")
         self.query = env.get("QUERY_STRING", "")
         self.params = parse_query_params(config, self.query)
-        self.arguments = None
+        params: dict = self.params
+        arguments: list = []
+        value: str
+        flags = config.get_flags()
+        for key, value in params.items():
+            arguments.append(flags[key])
+            if value and not value.isspace():
+                arguments.append(value)
+        self.arguments = arguments
+        thread_name = threading.current_thread().name
+        self.label = f"[{thread_name}][{self.method}][{self.path}][{self.query}]"
 
     def get_label(self) -> str:
         """Get logging prefix for this request."""
-        return f"[{threading.current_thread().name}][{self.method}][{self.path}][{self.query}]"
+        return self.label
 
     def get_arguments(self):
         """Get the arguments to pass to the executable."""
-        if self.arguments is None:
-            self.arguments = []
-            for key, value in self.params.items():
-                self.arguments.append(f"--{key}")
-                if value.strip() != "":
-                    self.arguments.append(value)
         return self.arguments
 
-    def execute(self) -> Tuple[str, int]:
+    def execute(self) -> Tuple[bytes, int]:
         """Execute the invocation requested."""
-        cmd = [os.path.abspath(self.config.get_executable_path())]
-        cmd += self.get_arguments()
-        print(f"{self.get_label()} Executing '{cmd}'")
+        pool = self.config.get_worker_pool()
+        if pool is not None:
+            LOGGER.info("%s Sending '%s' to persistent worker", self.label, self.arguments)
+            return (pool.invoke(self.arguments), 0)
+        cmd = [self.config.get_abs_executable_path()]
+        cmd += self.arguments
+        LOGGER.info("%s Executing '%s'", self.label, cmd)
+        # No cwd, session, or fd-closing arguments: they force fork() instead of posix_spawn()
         proc = subprocess.run(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
+            bufsize=-1,
             check=False,
-            cwd=".",
-            start_new_session=True,
+            close_fds=False,
         )
-        return (proc.stdout.decode(), proc.returncode)
+        return (proc.stdout, proc.returncode)
 
 
 ###
@@ -214,21 +446,22 @@ class InvocationRequest:
 
 def microwrap(env: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
     """WSGI application that translates HTTP requests to invocations of an arbitrary executable."""
+    config = None
     try:
-        config = Config(CONFIG_PATH)
+        config = get_config(CONFIG_PATH)
         handler = InvocationRequest(config, env)
-        print(f"{handler.get_label()} Configuration: {config}")
-        print(f"{handler.get_label()} Parameters: {handler.params}")
+        LOGGER.info("%s Configuration: %s", handler.label, config)
+        LOGGER.info("%s Parameters: %s", handler.label, handler.params)
         body, exitcode = handler.execute()
-        print(f"{handler.get_label()} Finished execution, exit code: {exitcode}")
+        LOGGER.info("%s Finished execution, exit code: %s", handler.label, exitcode)
         status = "200 OK" if exitcode == 0 else "500 Internal Server Error"
-        start_response(status, get_response_headers(body))
-        return [body.encode()]
+        start_response(status, get_response_headers(body, config))
+        return [body]
     except Exception as ex:
-        traceback.print_exception(ex)
-        body = f"MicroWrap error: {type(ex)}: {ex}"
-        start_response("500 Internal Server Error", get_response_headers(body))
-        return [body.encode()]
+        LOGGER.exception("MicroWrap error")
+        body = f"MicroWrap error: {type(ex)}: {ex}".encode()
+        start_response("500 Internal Server Error", get_response_headers(body, config))
+        return [body]
 
 
 ###
@@ -236,41 +469,238 @@ def microwrap(env: WSGIEnvironment, start_response: StartResponse) -> Iterable[b
 ###
 
 
-class ThreadedWSGIServer(ThreadingMixIn, WSGIServer):
-    """Threaded WSGI Server that uses a thread for each request."""
+_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+
+
+def get_executor(threads: int) -> ThreadPoolExecutor:
+    """Return the shared executor with the given number of threads for handling requests."""
+    executor = _EXECUTORS.get(threads)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="Request")
+        _EXECUTORS[threads] = executor
+    return executor
 
-    def get_request(self):
-        while True:
-            try:
-                sock, addr = self.socket.accept()
-                if self.verify_request(sock, addr):
-                    return sock, addr
-            except OSError as ex:
-                if ex.errno != errno.EINTR:
-                    raise
 
+def shutdown_executors():
+    """Shut down the shared executors, waiting for requests in progress to finish."""
+    while _EXECUTORS:
+        _, executor = _EXECUTORS.popitem()
+        executor.shutdown(wait=True)
 
-def run(host="0.0.0.0", port=80, concurrent=True):
-    """Run the WSGI application."""
-    print(f"Listening on http://{host}:{port}/")
+
+class LoggingWSGIRequestHandler(WSGIRequestHandler):
+    """WSGI request handler that logs requests and errors through LOGGER, not sys.stderr."""
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        LOGGER.info(
+            "%s - - [%s] %s", self.address_string(), self.log_date_time_string(), format % args
+        )
+
+    def log_error(self, format, *args):  # pylint: disable=redefined-builtin
+        LOGGER.error(
+            "%s - - [%s] %s", self.address_string(), self.log_date_time_string(), format % args
+        )
+
+    def get_stderr(self):
+        # wsgiref prints application tracebacks to this stream and flushes it afterwards
+        return LoggerStream(LOGGER, logging.ERROR)
+
+
+class InterruptibleWSGIServer(WSGIServer):
+    """WSGI Server that serves until SIGINT, SIGTERM or shutdown(), sleeping until needed."""
+
+    interrupted = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Written to by shutdown() and by signal delivery to wake up serve_forever
+        self.wakeup_read, self.wakeup_write = os.pipe()
+        os.set_blocking(self.wakeup_read, False)
+        os.set_blocking(self.wakeup_write, False)
+        self.is_shut_down = threading.Event()
+
+    def handle_error(self, request, client_address):
+        """Log an exception raised while handling a request instead of printing it."""
+        LOGGER.exception("Exception occurred during processing of request from %s", client_address)
+
+    def interrupt(self, _signum, _frame):
+        """Signal handler that makes serve_forever return once the current request is done."""
+        self.interrupted = True
+
+    def serve_forever(self, poll_interval=None):
+        """Handle requests until shutdown(), or SIGINT or SIGTERM when on the main thread."""
+        self.is_shut_down.clear()
+        # Signals can be delivered to any thread, but Python only runs their handlers on the
+        # main thread; the wakeup fd makes the main thread's select return so that they run
+        handle_signals = threading.current_thread() is threading.main_thread()
+        if handle_signals:
+            previous_wakeup_fd = signal.set_wakeup_fd(self.wakeup_write)
+            previous_handlers = {
+                signum: signal.signal(signum, self.interrupt)
+                for signum in (signal.SIGINT, signal.SIGTERM)
+            }
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self, selectors.EVENT_READ)
+                selector.register(self.wakeup_read, selectors.EVENT_READ)
+                while not self.interrupted:
+                    for key, _ in selector.select(poll_interval):
+                        if key.fileobj is self:
+                            self._handle_request_noblock()
+                        else:
+                            os.read(self.wakeup_read, 512)
+                    self.service_actions()
+        finally:
+            if handle_signals:
+                for signum, handler in previous_handlers.items():
+                    signal.signal(signum, handler)
+                signal.set_wakeup_fd(previous_wakeup_fd)
+            self.interrupted = False
+            self.is_shut_down.set()
+
+    def shutdown(self):
+        """Stop serve_forever, which may be running on another thread, and wait for it."""
+        self.interrupted = True
+        try:
+            os.write(self.wakeup_write, b"\0")
+        except BlockingIOError:
+            pass  # the pipe is full, so serve_forever is already awake
+        self.is_shut_down.wait()
+
+    def server_close(self):
+        super().server_close()
+        os.close(self.wakeup_read)
+        os.close(self.wakeup_write)
+
+
+class ThreadedWSGIServer(ThreadingMixIn, InterruptibleWSGIServer):
+    """Threaded WSGI Server that handles requests on a fixed-size pool of threads."""
+
+    # Let every preforked server process bind the port so the kernel balances connections
+    allow_reuse_port = True
+
+    def __init__(self, server_address, handler_class, threads: int):
+        super().__init__(server_address, handler_class)
+        self.executor = get_executor(threads)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+
+def ignore_interrupts():
+    """Ignore SIGINT and SIGTERM, so that a shutdown in progress runs to completion."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+def interrupt(_signum, _frame):
+    """Signal handler that raises KeyboardInterrupt once to shut the server down."""
+    ignore_interrupts()
+    raise KeyboardInterrupt
+
+
+def serve_bjoern(host: str, port: int):
+    """Serve the WSGI application with bjoern until interrupted."""
+    LOGGER.info("Starting bjoern server...")
+    try:
+        bjoern.run(microwrap, host, port, reuse_port=True)
+    except KeyboardInterrupt:
+        ignore_interrupts()
+        LOGGER.info("Shutting down...")
+
+
+def serve_wsgiref(host: str, port: int, concurrent: bool, threads: int):
+    """Serve the WSGI application with the pure-Python reference server until interrupted."""
     if concurrent:
-        print("Starting concurrent server...")
-        httpd = ThreadedWSGIServer((host, port), WSGIRequestHandler)
+        LOGGER.info("Starting concurrent server with %s threads...", threads)
+        httpd = ThreadedWSGIServer((host, port), LoggingWSGIRequestHandler, threads)
     else:
-        print("Starting non-concurrent server...")
-        httpd = WSGIServer((host, port), WSGIRequestHandler)
+        LOGGER.info("Starting non-concurrent server...")
+        httpd = InterruptibleWSGIServer((host, port), LoggingWSGIRequestHandler)
     httpd.set_app(microwrap)
     try:
-        httpd.serve_forever(poll_interval=0.5)
+        httpd.serve_forever()
+        LOGGER.info("Shutting down...")
+    finally:
+        httpd.server_close()
+        shutdown_executors()
+
+
+def prefork(processes: int, serve: Callable[..., None], *args):
+    """Call serve(*args) in each of the given number of forked processes and wait for them."""
+    # Flush buffered records so that they are not written again by every child
+    for handler in LOGGER.handlers:
+        handler.flush()
+    children = []
+    for _ in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            # The parent turns SIGTERM into SIGINT for its children, which bjoern handles
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            exitcode = 0
+            try:
+                serve(*args)
+            except Exception:
+                LOGGER.exception("Server process failed")
+                exitcode = 1
+            finally:
+                logging.shutdown()
+                os._exit(exitcode)
+        children.append(pid)
+    signal.signal(signal.SIGINT, interrupt)
+    signal.signal(signal.SIGTERM, interrupt)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
     except KeyboardInterrupt:
-        print("\nShutting down...")
-        httpd.shutdown()
+        for pid in children:
+            try:
+                # An exited child keeps its pid until it is reaped, so this never signals an
+                # unrelated process; both servers shut down cleanly on SIGINT
+                if os.waitpid(pid, os.WNOHANG)[0] == 0:
+                    os.kill(pid, signal.SIGINT)
+            except ChildProcessError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+
+def run(
+    host="0.0.0.0",
+    port=80,
+    concurrent=True,
+    threads=None,
+    processes=DEFAULT_PROCESSES,
+):
+    """Run the WSGI application; threads is the number of threads in each server process."""
+    LOGGER.info("Listening on http://%s:%s/", host, port)
+    if not concurrent:
+        processes = 1
+    if threads is None:
+        threads = max(1, DEFAULT_THREADS // processes)
+    if bjoern is None:
+        serve, args = serve_wsgiref, (host, port, concurrent, threads)
+    else:
+        serve, args = serve_bjoern, (host, port)
+    if processes > 1:
+        LOGGER.info("Starting %s server processes...", processes)
+        prefork(processes, serve, *args)
+    elif bjoern is not None:
+        # bjoern only shuts down cleanly on SIGINT, so a parent turns SIGTERM into SIGINT
+        prefork(1, serve, *args)
+    else:
+        serve(*args)
 
 
 if __name__ == "__main__":
-    global_config = Config(CONFIG_PATH)
+    global_config = get_config(CONFIG_PATH)
     run(
         global_config.get_host(),
         global_config.get_port(),
         global_config.get_concurrent(),
+        global_config.get_thread_count(),
+        global_config.get_process_count(),
     )